@@ -90,6 +90,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
 }
 
+# Background analysis jobs
+ANALYZE_ASYNC_THRESHOLD = 1000  # batches larger than this return 202 with a job id
+ANALYSIS_JOB_TTL_SECONDS = 3600
+ANALYSIS_JOB_STALE_SECONDS = 900  # running jobs older than this are failed (their worker died)
+ANALYSIS_JOB_INLINE_WORKERS = 2  # in-process worker threads; 0 leaves jobs to `manage.py analysis_worker`
+ANALYSIS_JOB_PAGE_SIZE = 500  # default page size and the row count per stored result chunk
+
+# Columnar task snapshots (`manage.py build_task_snapshot`)
+TASK_SNAPSHOT_DIR = BASE_DIR / 'snapshots'
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8000",
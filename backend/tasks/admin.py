@@ -1,9 +1,16 @@
 from django.contrib import admin
-from .models import Task
+from .models import AnalysisJob, Task
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ['title', 'due_date', 'estimated_hours', 'importance', 'created_at']
     list_filter = ['due_date', 'importance', 'created_at']
     search_fields = ['title']
-    date_hierarchy = 'due_date'
\ No newline at end of file
+    date_hierarchy = 'due_date'
+
+@admin.register(AnalysisJob)
+class AnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'strategy', 'total_tasks', 'created_at', 'finished_at', 'expires_at']
+    list_filter = ['status', 'strategy']
+    exclude = ['payload']
+    readonly_fields = ['status', 'strategy', 'total_tasks', 'result_chunk_size', 'error', 'started_at', 'finished_at', 'expires_at']
@@ -0,0 +1,174 @@
+"""
+Background analysis jobs backed by the AnalysisJob table (no external broker).
+
+Oversized analyze requests are enqueued as pending rows. They are picked up either
+by the in-process thread pool (ANALYSIS_JOB_INLINE_WORKERS) or by the
+`analysis_worker` management command. Claiming a job is a conditional UPDATE, so
+several workers can poll the same table safely.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import AnalysisJob
+from .scoring import TaskScorer
+from .validation import normalize_tasks
+
+DEFAULT_ASYNC_THRESHOLD = 1000
+DEFAULT_JOB_TTL_SECONDS = 3600
+DEFAULT_INLINE_WORKERS = 2
+DEFAULT_STALE_SECONDS = 900
+DEFAULT_PAGE_SIZE = 500
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_async_threshold():
+    return getattr(settings, 'ANALYZE_ASYNC_THRESHOLD', DEFAULT_ASYNC_THRESHOLD)
+
+
+def get_page_size():
+    return getattr(settings, 'ANALYSIS_JOB_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+
+
+def enqueue_analysis(tasks_data, strategy):
+    """Store a pending job and hand it to the inline pool once the row is committed"""
+    ttl = getattr(settings, 'ANALYSIS_JOB_TTL_SECONDS', DEFAULT_JOB_TTL_SECONDS)
+    job = AnalysisJob(strategy=strategy, expires_at=timezone.now() + timedelta(seconds=ttl))
+    job.set_payload(tasks_data)
+    job.save()
+
+    transaction.on_commit(lambda: _submit_inline(job.pk))
+    return job
+
+
+def claim_job(job_id):
+    """Atomically move a pending job to running; returns the job or None if someone else got it"""
+    claimed = AnalysisJob.objects.filter(
+        pk=job_id,
+        status=AnalysisJob.STATUS_PENDING,
+        expires_at__gt=timezone.now(),
+    ).update(status=AnalysisJob.STATUS_RUNNING, started_at=timezone.now())
+
+    if not claimed:
+        return None
+    return AnalysisJob.objects.get(pk=job_id)
+
+
+def claim_next_job():
+    candidates = AnalysisJob.objects.filter(
+        status=AnalysisJob.STATUS_PENDING,
+        expires_at__gt=timezone.now(),
+    ).order_by('created_at').values_list('pk', flat=True)[:10]
+
+    for job_id in candidates:
+        job = claim_job(job_id)
+        if job is not None:
+            return job
+    return None
+
+
+def run_job(job):
+    """Score a claimed job and persist the result (or the error)"""
+    try:
+        tasks, errors = normalize_tasks(job.get_payload())
+        if errors:
+            raise ValueError(f"{len(errors)} validation error(s) in submitted tasks")
+
+        scorer = TaskScorer(job.strategy)
+        circular_deps = scorer.detect_circular_dependencies(tasks)
+        if circular_deps:
+            raise ValueError(f"Circular dependencies detected: {circular_deps}")
+
+        job.save_result(scorer.score_tasks(tasks), get_page_size())
+        job.status = AnalysisJob.STATUS_DONE
+    except Exception as e:
+        print(f"❌ Analysis job {job.pk} failed: {str(e)}")  # Debug log
+        print(traceback.format_exc())
+        job.status = AnalysisJob.STATUS_FAILED
+        job.error = str(e)
+
+    # The input is no longer needed once the job has finished. The update only
+    # applies while the job is still running, so a job already failed as stale stays failed
+    job.payload = b''
+    job.finished_at = timezone.now()
+    AnalysisJob.objects.filter(pk=job.pk, status=AnalysisJob.STATUS_RUNNING).update(
+        status=job.status,
+        result_chunk_size=job.result_chunk_size,
+        error=job.error,
+        payload=job.payload,
+        finished_at=job.finished_at,
+    )
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Drain the queue in the calling thread; returns the number of jobs processed"""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def fail_stale_jobs(job_id=None):
+    """
+    Fail jobs that have been running longer than ANALYSIS_JOB_STALE_SECONDS, which
+    means their worker died; returns the number of jobs failed
+    """
+    stale_seconds = getattr(settings, 'ANALYSIS_JOB_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+    stale_jobs = AnalysisJob.objects.filter(
+        status=AnalysisJob.STATUS_RUNNING,
+        started_at__lte=timezone.now() - timedelta(seconds=stale_seconds),
+    )
+    if job_id is not None:
+        stale_jobs = stale_jobs.filter(pk=job_id)
+
+    return stale_jobs.update(
+        status=AnalysisJob.STATUS_FAILED,
+        error='Worker stopped before the job finished',
+        payload=b'',
+        finished_at=timezone.now(),
+    )
+
+
+def purge_expired_jobs():
+    deleted, _ = AnalysisJob.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def _get_executor():
+    global _executor
+    workers = getattr(settings, 'ANALYSIS_JOB_INLINE_WORKERS', DEFAULT_INLINE_WORKERS)
+    if workers <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-job')
+        return _executor
+
+
+def _submit_inline(job_id):
+    executor = _get_executor()
+    if executor is not None:
+        executor.submit(_process_inline, job_id)
+
+
+def _process_inline(job_id):
+    close_old_connections()
+    try:
+        job = claim_job(job_id)
+        if job is not None:
+            run_job(job)
+    finally:
+        close_old_connections()
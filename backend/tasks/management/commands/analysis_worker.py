@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.jobs import fail_stale_jobs, purge_expired_jobs, run_pending_jobs
+
+class Command(BaseCommand):
+    help = 'Process queued analysis jobs from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+        self.stdout.write(self.style.SUCCESS('Analysis worker started'))
+
+        try:
+            while True:
+                close_old_connections()
+
+                stale = fail_stale_jobs()
+                if stale:
+                    self.stdout.write(self.style.WARNING(f'Failed {stale} stale jobs'))
+
+                purged = purge_expired_jobs()
+                if purged:
+                    self.stdout.write(f'Purged {purged} expired jobs')
+
+                processed = run_pending_jobs()
+                if processed:
+                    self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs'))
+
+                if options['once']:
+                    break
+                if not processed:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Analysis worker stopped')
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.serializers import TaskSerializer
+from tasks.synthetic import build_backlog
+from tasks.validation import normalize_tasks
+
+class Command(BaseCommand):
+    help = 'Compare normalize_tasks against DRF serializer validation on a synthetic backlog'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help='Backlog size')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        tasks_data = build_backlog(options['tasks'], options['seed'])
+        self.stdout.write(f"Validating {len(tasks_data)} tasks")
+
+        started = time.perf_counter()
+        _, errors = normalize_tasks(tasks_data)
+        normalize_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        serializer = TaskSerializer(data=tasks_data, many=True)
+        serializer.is_valid()
+        drf_elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"normalize_tasks:  {normalize_elapsed:.3f}s ({len(errors)} errors)")
+        self.stdout.write(f"TaskSerializer:   {drf_elapsed:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {drf_elapsed / normalize_elapsed:.1f}x"))
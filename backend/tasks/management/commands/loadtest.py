@@ -0,0 +1,281 @@
+import asyncio
+import json
+import math
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+
+from tasks.jobs import get_async_threshold
+from tasks.synthetic import build_backlog
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+ENDPOINTS = {
+    'analyze': '/api/tasks/analyze/',
+    'suggest': '/api/tasks/suggest/',
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def read_peak_rss_kb(pid=None):
+    """Peak resident set size in kB for a pid (via /proc) or for this process"""
+    if pid is None:
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kB on Linux
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+    try:
+        with open(f'/proc/{pid}/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def http_request(host, port, method, path, body=b''):
+    """Minimal HTTP/1.1 request over asyncio streams; returns (status_code, response_body)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'{method} {path} HTTP/1.1\r\n'
+            f'Host: {host}:{port}\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            'Connection: close\r\n\r\n'.encode('latin-1') + body
+        )
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    head, _, response_body = response.partition(b'\r\n\r\n')
+    return int(head.split(b'\r\n', 1)[0].split()[1]), response_body
+
+
+async def wait_for_job(host, port, status_url, poll_interval, timeout):
+    """Poll a queued analysis job until it finishes; returns the final HTTP status code"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        # Only the job state is needed, so ask for a single result row
+        status_code, response_body = await http_request(host, port, 'GET', f'{status_url}?limit=1')
+        if status_code != 200:
+            return status_code
+        job_status = json.loads(response_body)['status']
+        if job_status == 'done':
+            return 200
+        if job_status == 'failed':
+            return 500
+        await asyncio.sleep(poll_interval)
+    return 504
+
+
+async def timed_request(host, port, path, body, poll_interval, job_timeout):
+    """
+    POST a backlog and return (status_code, latency_seconds, queued). Queued (202)
+    analyses are polled to completion so the latency covers the actual analysis.
+    """
+    started = time.perf_counter()
+    status_code, response_body = await http_request(host, port, 'POST', path, body)
+    queued = status_code == 202
+    if queued:
+        status_code = await wait_for_job(
+            host, port, json.loads(response_body)['status_url'], poll_interval, job_timeout
+        )
+    return status_code, time.perf_counter() - started, queued
+
+
+async def run_scenario(host, port, path, body, total_requests, concurrency, poll_interval=0.05, job_timeout=300):
+    latencies = []
+    status_codes = {}
+    errors = 0
+    queued_jobs = 0
+    remaining = iter(range(total_requests))
+
+    async def worker():
+        nonlocal errors, queued_jobs
+        for _ in remaining:
+            try:
+                status_code, latency, queued = await timed_request(
+                    host, port, path, body, poll_interval, job_timeout
+                )
+            except (OSError, ValueError, IndexError, KeyError):
+                errors += 1
+                continue
+            queued_jobs += queued
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+            if status_code >= 400:
+                errors += 1
+            latencies.append(latency)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        'requests': total_requests,
+        'queued_jobs': queued_jobs,
+        'errors': errors,
+        'error_rate': round(errors / total_requests, 4) if total_requests else 0.0,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(total_requests / elapsed, 2) if elapsed else None,
+        'status_codes': {str(code): count for code, count in sorted(status_codes.items())},
+        'latency_ms': {
+            'p50': to_ms(percentile(latencies, 50)),
+            'p95': to_ms(percentile(latencies, 95)),
+            'p99': to_ms(percentile(latencies, 99)),
+            'mean': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+            'max': to_ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_in_process_server():
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comma_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Drive concurrent load at the analyze/suggest endpoints and report latency percentiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server (default: start the app in-process)')
+        parser.add_argument('--server-pid', type=int,
+                            help='PID of the server behind --url, used to read its peak RSS')
+        parser.add_argument('--endpoints', default='analyze,suggest',
+                            help='Comma-separated endpoints to hit (analyze, suggest)')
+        parser.add_argument('--sizes', default='10,100,500',
+                            help='Comma-separated backlog sizes')
+        parser.add_argument('--strategies', default='smart_balance',
+                            help='Comma-separated scoring strategies')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--requests', type=int, default=100, help='Requests per scenario')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--poll-interval', type=float, default=0.05,
+                            help='Seconds between status polls for queued (202) analyses')
+        parser.add_argument('--job-timeout', type=float, default=300,
+                            help='Seconds to wait for a queued analysis before counting it as an error')
+        parser.add_argument('--output', default='loadtest_results.json', help='Path of the JSON report')
+
+    def handle(self, *args, **options):
+        endpoints = comma_list(options['endpoints'])
+        strategies = comma_list(options['strategies'])
+        unknown = [name for name in endpoints if name not in ENDPOINTS]
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(unknown)}")
+        try:
+            sizes = [int(size) for size in comma_list(options['sizes'])]
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be positive')
+
+        server = None
+        base_path = ''
+        if options['url']:
+            target = urlsplit(options['url'])
+            host, port = target.hostname, target.port or 80
+            base_path = target.path.rstrip('/')
+        else:
+            server = start_in_process_server()
+            host, port = server.server_address[:2]
+
+        self.stdout.write(f'Target: http://{host}:{port}')
+
+        scenarios = []
+        try:
+            for endpoint in endpoints:
+                for strategy in strategies:
+                    for size in sizes:
+                        body = json.dumps({
+                            'tasks': build_backlog(size, options['seed']),
+                            'strategy': strategy,
+                        }).encode('utf-8')
+                        result = asyncio.run(run_scenario(
+                            host, port, base_path + ENDPOINTS[endpoint], body,
+                            options['requests'], options['concurrency'],
+                            options['poll_interval'], options['job_timeout'],
+                        ))
+                        scenarios.append({'endpoint': endpoint, 'strategy': strategy, 'size': size, **result})
+
+                        latency = result['latency_ms']
+                        self.stdout.write(
+                            f"{endpoint:<8} {strategy:<16} size={size:<6} "
+                            f"rps={result['throughput_rps']} p50={latency['p50']}ms "
+                            f"p95={latency['p95']}ms p99={latency['p99']}ms "
+                            f"errors={result['error_rate']:.2%} queued={result['queued_jobs']}"
+                        )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+        # In-process runs share the client's process, so this includes the load generator
+        if server is not None:
+            peak_rss_kb = read_peak_rss_kb()
+        elif options['server_pid']:
+            peak_rss_kb = read_peak_rss_kb(options['server_pid'])
+        else:
+            peak_rss_kb = None
+
+        report = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'commit': current_commit(),
+            'target': options['url'] or 'in-process',
+            'concurrency': options['concurrency'],
+            'requests_per_scenario': options['requests'],
+            'seed': options['seed'],
+            # Only known for in-process runs; a remote server may be configured differently
+            'analyze_async_threshold': get_async_threshold() if server is not None else None,
+            'server_peak_rss_kb': peak_rss_kb,
+            'scenarios': scenarios,
+        }
+
+        with open(options['output'], 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote load test report to {options['output']}"))
@@ -1,6 +1,10 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 import json
+import uuid
+import zlib
 
 class Task(models.Model):
     title = models.CharField(max_length=200)
@@ -27,4 +31,91 @@ class Task(models.Model):
         if isinstance(value, list):
             self.dependencies = json.dumps(value)
         else:
-            self.dependencies = '[]'
\ No newline at end of file
+            self.dependencies = '[]'
+
+class AnalysisJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    strategy = models.CharField(max_length=50, default='smart_balance')
+    total_tasks = models.PositiveIntegerField(default=0)
+    payload = models.BinaryField()
+    result_chunk_size = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Analysis job {self.id} ({self.status})"
+
+    # Payloads and results are stored as zlib-compressed compact JSON
+    @staticmethod
+    def _pack(value):
+        return zlib.compress(json.dumps(value, separators=(',', ':'), cls=DjangoJSONEncoder).encode('utf-8'))
+
+    @staticmethod
+    def _unpack(blob):
+        if blob is None:
+            return None
+        return json.loads(zlib.decompress(bytes(blob)).decode('utf-8'))
+
+    def get_payload(self):
+        return self._unpack(self.payload) or []
+
+    def set_payload(self, tasks):
+        self.payload = self._pack(tasks)
+        self.total_tasks = len(tasks)
+
+    def save_result(self, tasks, chunk_size):
+        """Store sorted results as separately compressed chunks so pages can be read on their own"""
+        self.result_chunks.all().delete()
+        AnalysisJobResultChunk.objects.bulk_create([
+            AnalysisJobResultChunk(job=self, index=index, data=self._pack(tasks[start:start + chunk_size]))
+            for index, start in enumerate(range(0, len(tasks), chunk_size))
+        ])
+        self.result_chunk_size = chunk_size
+
+    def get_result_page(self, offset, limit):
+        """Decode only the chunks overlapping [offset, offset + limit)"""
+        if not self.result_chunk_size or offset >= self.total_tasks:
+            return []
+
+        first_chunk = offset // self.result_chunk_size
+        last_chunk = (offset + limit - 1) // self.result_chunk_size
+        rows = []
+        for chunk in self.result_chunks.filter(index__gte=first_chunk, index__lte=last_chunk):
+            rows.extend(self._unpack(chunk.data))
+
+        start = offset - first_chunk * self.result_chunk_size
+        return rows[start:start + limit]
+
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+class AnalysisJobResultChunk(models.Model):
+    job = models.ForeignKey(AnalysisJob, on_delete=models.CASCADE, related_name='result_chunks')
+    index = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ['index']
+        unique_together = [('job', 'index')]
+
+    def __str__(self):
+        return f"Result chunk {self.index} of job {self.job_id}"
@@ -14,71 +14,50 @@ class TaskScorer:
         }
         return weights.get(strategy, weights["smart_balance"])
     
+    # The calculate_* methods expect values already normalized by tasks.validation.normalize_tasks
     def calculate_urgency_score(self, due_date, today=None):
         if today is None:
             today = date.today()
         
         if not due_date:
             return 0.5
-            
-        try:
-            due_date_obj = date.fromisoformat(due_date) if isinstance(due_date, str) else due_date
-            days_until_due = (due_date_obj - today).days
-            
-            if days_until_due < 0:
-                return 1.0
-            elif days_until_due == 0:
-                return 0.9
-            elif days_until_due <= 1:
-                return 0.8
-            elif days_until_due <= 3:
-                return 0.6
-            elif days_until_due <= 7:
-                return 0.4
-            else:
-                return 0.2
-        except (ValueError, TypeError):
-            return 0.5
+        
+        due_date_obj = date.fromisoformat(due_date) if isinstance(due_date, str) else due_date
+        days_until_due = (due_date_obj - today).days
+        
+        if days_until_due < 0:
+            return 1.0
+        elif days_until_due == 0:
+            return 0.9
+        elif days_until_due <= 1:
+            return 0.8
+        elif days_until_due <= 3:
+            return 0.6
+        elif days_until_due <= 7:
+            return 0.4
+        else:
+            return 0.2
     
     def calculate_importance_score(self, importance):
-        try:
-            importance_val = int(importance)
-            return max(0.1, min(1.0, importance_val / 10.0))
-        except (ValueError, TypeError):
-            return 0.5
+        return max(0.1, min(1.0, importance / 10.0))
     
     def calculate_effort_score(self, estimated_hours):
-        try:
-            hours = float(estimated_hours)
-            if hours <= 1:
-                return 1.0
-            elif hours <= 4:
-                return 0.7
-            elif hours <= 8:
-                return 0.4
-            else:
-                return 0.2
-        except (ValueError, TypeError):
-            return 0.5
+        if estimated_hours <= 1:
+            return 1.0
+        elif estimated_hours <= 4:
+            return 0.7
+        elif estimated_hours <= 8:
+            return 0.4
+        else:
+            return 0.2
     
-    def calculate_dependency_score(self, dependencies, all_tasks):
-        if not dependencies or not isinstance(dependencies, list):
-            return 0.5
-        
-        try:
-            task_index = all_tasks.index(all_tasks)
-            blocking_count = 0
-            for task in all_tasks:
-                task_deps = task.get('dependencies', [])
-                if isinstance(task_deps, list) and (task_index + 1) in task_deps:
-                    blocking_count += 1
-            
-            if blocking_count > 0:
-                return 1.0
-            else:
-                return 0.3
-        except (ValueError, IndexError):
-            return 0.5
+    def calculate_dependency_score(self, is_blocking):
+        # Tasks that other tasks depend on are prioritized; everything else stays neutral
+        return 1.0 if is_blocking else 0.5
+    
+    def find_blocking_positions(self, tasks):
+        """1-based positions of tasks that at least one other task depends on"""
+        return {dependency for task in tasks for dependency in task.get('dependencies', [])}
     
     def detect_circular_dependencies(self, tasks):
         graph = {}
@@ -91,28 +70,29 @@ class TaskScorer:
         rec_stack = set()
         circular_deps = []
         
-        def dfs(node, path):
-            if node in rec_stack:
-                cycle_start = path.index(node)
-                circular_deps.append(path[cycle_start:])
-                return
+        # Iterative DFS so long dependency chains cannot hit the recursion limit
+        for start in graph:
+            if start in visited:
+                continue
             
-            if node in visited:
-                return
+            visited.add(start)
+            rec_stack.add(start)
+            path = [start]
+            neighbor_iters = [iter(graph.get(start, []))]
             
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            for neighbor in graph.get(node, []):
-                dfs(neighbor, path.copy())
-            
-            rec_stack.remove(node)
-            path.pop()
-        
-        for node in graph:
-            if node not in visited:
-                dfs(node, [])
+            while neighbor_iters:
+                for neighbor in neighbor_iters[-1]:
+                    if neighbor in rec_stack:
+                        circular_deps.append(path[path.index(neighbor):])
+                    elif neighbor not in visited:
+                        visited.add(neighbor)
+                        rec_stack.add(neighbor)
+                        path.append(neighbor)
+                        neighbor_iters.append(iter(graph.get(neighbor, [])))
+                        break
+                else:
+                    neighbor_iters.pop()
+                    rec_stack.remove(path.pop())
         
         return circular_deps
     
@@ -120,11 +100,19 @@ class TaskScorer:
         if all_tasks is None:
             all_tasks = [task]
         
-        urgency_score = self.calculate_urgency_score(task.get('due_date', ''))
+        position = next((i for i, other in enumerate(all_tasks, start=1) if other is task), None)
+        is_blocking = position in self.find_blocking_positions(all_tasks)
+        return self._score_task(task, is_blocking)
+    
+    def _score_task(self, task, is_blocking, today=None):
+        urgency_score = self.calculate_urgency_score(task.get('due_date', ''), today)
         importance_score = self.calculate_importance_score(task.get('importance', 5))
         effort_score = self.calculate_effort_score(task.get('estimated_hours', 1))
-        dependency_score = self.calculate_dependency_score(task.get('dependencies', []), all_tasks)
+        dependency_score = self.calculate_dependency_score(is_blocking)
         
+        return self._build_score_result(urgency_score, importance_score, effort_score, dependency_score)
+    
+    def _build_score_result(self, urgency_score, importance_score, effort_score, dependency_score):
         overall_score = (
             urgency_score * self.weights['urgency'] +
             importance_score * self.weights['importance'] +
@@ -155,4 +143,65 @@ class TaskScorer:
                 'effort': round(effort_score, 3),
                 'dependency': round(dependency_score, 3)
             }
-        }
\ No newline at end of file
+        }
+    
+    def score_tasks(self, tasks, today=None):
+        """Score a normalized batch and return the tasks sorted by priority (descending)"""
+        if today is None:
+            today = date.today()
+        
+        blocking_positions = self.find_blocking_positions(tasks)
+        scored_tasks = []
+        for position, task in enumerate(tasks, start=1):
+            score_result = self._score_task(task, position in blocking_positions, today)
+            scored_tasks.append({**task, **score_result})
+        
+        return sorted(scored_tasks, key=lambda x: x['priority_score'], reverse=True)
+    
+    def score_snapshot(self, snapshot, today=None):
+        """
+        Score a TaskSnapshot straight from its columns and return the tasks sorted by
+        priority (descending); row dicts are only built for the sorted output
+        """
+        if today is None:
+            today = date.today()
+        
+        task_count = len(snapshot)
+        due_offsets = snapshot.due_offsets
+        importance = snapshot.importance
+        estimated_hours = snapshot.estimated_hours
+        
+        # One pass over the CSR edges marks every task that another task depends on
+        is_blocking = bytearray(task_count + 1)
+        for dependency in snapshot.dep_indices:
+            is_blocking[dependency] = 1
+        
+        # Backlogs share a small set of due dates, so urgency is computed once per day offset
+        urgency_by_offset = {}
+        score_results = []
+        for i in range(task_count):
+            due_offset = due_offsets[i]
+            urgency_score = urgency_by_offset.get(due_offset)
+            if urgency_score is None:
+                urgency_score = self.calculate_urgency_score(date.fromordinal(snapshot.base_ordinal + due_offset), today)
+                urgency_by_offset[due_offset] = urgency_score
+            
+            score_results.append(self._build_score_result(
+                urgency_score,
+                self.calculate_importance_score(importance[i]),
+                self.calculate_effort_score(estimated_hours[i]),
+                self.calculate_dependency_score(is_blocking[i + 1]),
+            ))
+        
+        order = sorted(range(task_count), key=lambda i: score_results[i]['priority_score'], reverse=True)
+        return [
+            {
+                'title': snapshot.title(i),
+                'due_date': snapshot.due_date(i),
+                'estimated_hours': estimated_hours[i],
+                'importance': importance[i],
+                'dependencies': snapshot.dependencies(i),
+                **score_results[i],
+            }
+            for i in order
+        ]
@@ -0,0 +1,230 @@
+"""
+Columnar binary snapshots of a task backlog, loaded with mmap.
+
+A snapshot stores a validated backlog as fixed-width little-endian arrays so it can be
+re-analyzed without re-parsing JSON or hitting the Task table:
+
+    header          64 bytes (magic, version, counts, base date ordinal)
+    estimated_hours float64[n]
+    due_offsets     int32[n]      days relative to the base date
+    dep_indptr      int32[n + 1]  CSR row pointers into dep_indices
+    dep_indices     int32[edges]  1-based task positions, as in the API
+    title_offsets   int32[n + 1]  byte offsets into the string table
+    importance      uint8[n]
+    titles          utf-8 string table
+
+Loading maps the file read-only and exposes each column as a memoryview over the
+mapping, so nothing is copied until a value is read.
+"""
+from array import array
+from datetime import date
+import mmap
+import os
+import re
+import struct
+import sys
+import uuid
+
+from django.conf import settings
+
+from .models import Task
+
+MAGIC = b'TASKSNAP'
+VERSION = 1
+HEADER = struct.Struct('<8sIIIiI36x')
+SNAPSHOT_SUFFIX = '.tsnap'
+SNAPSHOT_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _layout(task_count, edge_count):
+    """Byte offsets of every section; 8-byte columns come first so all sections stay aligned"""
+    offsets = {}
+    position = HEADER.size
+    for name, item_size, length in (
+        ('estimated_hours', 8, task_count),
+        ('due_offsets', 4, task_count),
+        ('dep_indptr', 4, task_count + 1),
+        ('dep_indices', 4, edge_count),
+        ('title_offsets', 4, task_count + 1),
+        ('importance', 1, task_count),
+    ):
+        offsets[name] = (position, position + item_size * length)
+        position += item_size * length
+    offsets['titles'] = position
+    return offsets
+
+
+def _int32_array(values):
+    column = array('i', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_snapshot(tasks, path):
+    """Write normalized tasks (see tasks.validation.normalize_tasks) to a snapshot file"""
+    base_ordinal = min((task['due_date'].toordinal() for task in tasks), default=date.today().toordinal())
+
+    dep_indptr = [0]
+    dep_indices = []
+    title_offsets = [0]
+    titles = bytearray()
+    for task in tasks:
+        dep_indices.extend(task['dependencies'])
+        dep_indptr.append(len(dep_indices))
+        titles += task['title'].encode('utf-8')
+        title_offsets.append(len(titles))
+
+    hours = array('d', (float(task['estimated_hours']) for task in tasks))
+    if sys.byteorder != 'little':
+        hours.byteswap()
+
+    header = HEADER.pack(MAGIC, VERSION, len(tasks), len(dep_indices), base_ordinal, len(titles))
+    sections = [
+        header,
+        hours.tobytes(),
+        _int32_array(task['due_date'].toordinal() - base_ordinal for task in tasks),
+        _int32_array(dep_indptr),
+        _int32_array(dep_indices),
+        _int32_array(title_offsets),
+        bytes(task['importance'] for task in tasks),
+        bytes(titles),
+    ]
+
+    # Write to a temporary file first so readers never see a partial snapshot
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as snapshot_file:
+        for section in sections:
+            snapshot_file.write(section)
+    os.replace(tmp_path, path)
+
+
+class TaskSnapshot:
+    """Read-only, memory-mapped view of a snapshot file"""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise ValueError('Memory-mapped snapshots require a little-endian platform')
+
+        with open(path, 'rb') as snapshot_file:
+            try:
+                self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError('Snapshot file is truncated')
+
+        try:
+            magic, version, task_count, edge_count, base_ordinal, titles_size = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError('Snapshot file is truncated')
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError('Not a task snapshot file (or unsupported version)')
+
+        # Check the header's counts against the file before any view is taken
+        offsets = _layout(task_count, edge_count)
+        if offsets['titles'] + titles_size > len(self._mmap):
+            self._mmap.close()
+            raise ValueError('Snapshot file is truncated')
+
+        self.base_ordinal = base_ordinal
+        self._buffer = memoryview(self._mmap)
+        column = lambda name, fmt: self._buffer[offsets[name][0]:offsets[name][1]].cast(fmt)
+
+        self.estimated_hours = column('estimated_hours', 'd')
+        self.due_offsets = column('due_offsets', 'i')
+        self.dep_indptr = column('dep_indptr', 'i')
+        self.dep_indices = column('dep_indices', 'i')
+        self.title_offsets = column('title_offsets', 'i')
+        self.importance = column('importance', 'B')
+        self.titles = self._buffer[offsets['titles']:offsets['titles'] + titles_size]
+        self._columns = [
+            self.estimated_hours, self.due_offsets, self.dep_indptr,
+            self.dep_indices, self.title_offsets, self.importance, self.titles,
+        ]
+
+    def __len__(self):
+        return len(self.importance)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        # Views must be released before the mapping can be closed
+        for view in self._columns:
+            view.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def title(self, index):
+        return str(self.titles[self.title_offsets[index]:self.title_offsets[index + 1]], 'utf-8')
+
+    def due_date(self, index):
+        return date.fromordinal(self.base_ordinal + self.due_offsets[index])
+
+    def dependencies(self, index):
+        return self.dep_indices[self.dep_indptr[index]:self.dep_indptr[index + 1]].tolist()
+
+    def to_tasks(self):
+        """Materialize rows as task dicts in the same shape normalize_tasks produces"""
+        return [
+            {
+                'title': self.title(i),
+                'due_date': self.due_date(i),
+                'estimated_hours': self.estimated_hours[i],
+                'importance': self.importance[i],
+                'dependencies': self.dependencies(i),
+            }
+            for i in range(len(self))
+        ]
+
+
+def get_snapshot_dir():
+    return getattr(settings, 'TASK_SNAPSHOT_DIR', os.path.join(settings.BASE_DIR, 'snapshots'))
+
+
+def snapshot_path(snapshot_id):
+    if not isinstance(snapshot_id, str) or not SNAPSHOT_ID_RE.match(snapshot_id):
+        raise ValueError('Invalid snapshot id')
+    return os.path.join(get_snapshot_dir(), snapshot_id + SNAPSHOT_SUFFIX)
+
+
+def save_snapshot(tasks):
+    """Store normalized tasks as a new snapshot and return its id"""
+    snapshot_id = uuid.uuid4().hex
+    os.makedirs(get_snapshot_dir(), exist_ok=True)
+    write_snapshot(tasks, snapshot_path(snapshot_id))
+    return snapshot_id
+
+
+def open_snapshot(snapshot_id):
+    """Raises ValueError for malformed ids and FileNotFoundError for unknown ones"""
+    return TaskSnapshot(snapshot_path(snapshot_id))
+
+
+def tasks_from_db():
+    """
+    Task rows as task dicts ordered by id. Stored dependencies are Task ids and are
+    remapped to 1-based positions; ids that no longer exist are dropped.
+    """
+    rows = list(Task.objects.order_by('id'))
+    position_by_id = {task.id: position for position, task in enumerate(rows, start=1)}
+
+    return [
+        {
+            'title': task.title,
+            'due_date': str(task.due_date),
+            'estimated_hours': task.estimated_hours,
+            'importance': task.importance,
+            'dependencies': [
+                position_by_id[dependency] for dependency in task.get_dependencies()
+                if dependency in position_by_id
+            ],
+        }
+        for task in rows
+    ]
@@ -0,0 +1,22 @@
+"""
+Synthetic task backlogs shared by the loadtest and benchmark_validation commands.
+"""
+from datetime import date, timedelta
+import random
+
+
+def build_backlog(size, seed=0):
+    """Synthetic backlog; dependencies only point at earlier tasks so the graph stays acyclic"""
+    rng = random.Random(seed)
+    today = date.today()
+    tasks = []
+    for i in range(size):
+        dependencies = rng.sample(range(1, i + 1), k=min(i, rng.randint(0, 2))) if i else []
+        tasks.append({
+            'title': f'Synthetic task {i + 1}',
+            'due_date': str(today + timedelta(days=rng.randint(-3, 30))),
+            'estimated_hours': round(rng.uniform(0.5, 12), 1),
+            'importance': rng.randint(1, 10),
+            'dependencies': dependencies,
+        })
+    return tasks
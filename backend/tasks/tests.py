@@ -1,6 +1,18 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 from datetime import date, timedelta
+from .management.commands.loadtest import percentile
+from .jobs import claim_next_job, purge_expired_jobs, run_job, run_pending_jobs
+from .models import AnalysisJob, Task
 from .scoring import TaskScorer
+from .snapshots import open_snapshot, save_snapshot, snapshot_path
+from .synthetic import build_backlog
+from .validation import normalize_tasks
 
 class TaskScoringTests(TestCase):
     def setUp(self):
@@ -27,6 +39,31 @@ class TaskScoringTests(TestCase):
         self.assertEqual(self.scorer.calculate_effort_score(3), 0.7)
         self.assertEqual(self.scorer.calculate_effort_score(10), 0.2)
     
+    def test_circular_dependency_detection_handles_long_chains(self):
+        chain = [{'dependencies': [i + 1]} for i in range(1, 5000)] + [{'dependencies': []}]
+        self.assertEqual(self.scorer.detect_circular_dependencies(chain), [])
+        
+        cycle = [{'dependencies': [2]}, {'dependencies': [3]}, {'dependencies': [1]}]
+        self.assertEqual(self.scorer.detect_circular_dependencies(cycle), [[1, 2, 3]])
+    
+    def test_blocking_tasks_rank_higher(self):
+        # root <- mid <- leaf: root and mid block other tasks, leaf blocks nothing
+        tasks = [
+            {'title': title, 'due_date': str(self.today + timedelta(days=10)), 'estimated_hours': 5,
+             'importance': 5, 'dependencies': dependencies}
+            for title, dependencies in (('leaf', [2]), ('mid', [3]), ('root', []))
+        ]
+        response = self.client.post('/api/tasks/analyze/', tasks, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        
+        ranked = response.json()['tasks']
+        self.assertEqual([task['title'] for task in ranked], ['mid', 'root', 'leaf'])
+        self.assertEqual(
+            [task['component_scores']['dependency'] for task in ranked],
+            [1.0, 1.0, 0.5]
+        )
+        self.assertIn('blocks other tasks', ranked[1]['explanation'])
+    
     def test_priority_score_calculation(self):
         task = {
             'title': 'Test Task',
@@ -40,4 +77,251 @@ class TaskScoringTests(TestCase):
         self.assertIn('priority_score', result)
         self.assertIn('explanation', result)
         self.assertIn('component_scores', result)
-        self.assertTrue(0 <= result['priority_score'] <= 1)
\ No newline at end of file
+        self.assertTrue(0 <= result['priority_score'] <= 1)
+
+
+@override_settings(ANALYZE_ASYNC_THRESHOLD=2, ANALYSIS_JOB_INLINE_WORKERS=0)
+class AnalysisJobTests(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.tasks = [
+            {'title': f'Task {i}', 'due_date': str(today + timedelta(days=i)),
+             'estimated_hours': i + 1, 'importance': 10 - i, 'dependencies': []}
+            for i in range(3)
+        ]
+    
+    def test_small_batch_is_analyzed_synchronously(self):
+        response = self.client.post('/api/tasks/analyze/', self.tasks[:2], content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_tasks'], 2)
+    
+    def test_oversized_batch_is_queued_and_paged(self):
+        response = self.client.post('/api/tasks/analyze/', self.tasks, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        status_url = response.json()['status_url']
+        
+        self.assertEqual(self.client.get(status_url).json()['status'], AnalysisJob.STATUS_PENDING)
+        self.assertEqual(run_pending_jobs(), 1)
+        
+        first_page = self.client.get(status_url, {'limit': 2}).json()
+        self.assertEqual(first_page['status'], AnalysisJob.STATUS_DONE)
+        self.assertEqual(len(first_page['tasks']), 2)
+        self.assertEqual(first_page['next_offset'], 2)
+        
+        second_page = self.client.get(status_url, {'offset': 2, 'limit': 2}).json()
+        self.assertEqual(len(second_page['tasks']), 1)
+        self.assertIsNone(second_page['next_offset'])
+        
+        scores = [t['priority_score'] for t in first_page['tasks'] + second_page['tasks']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+    
+    def test_circular_dependencies_fail_the_job_instead_of_the_request(self):
+        today = str(date.today())
+        chain = [
+            {'title': f'Step {i}', 'due_date': today, 'estimated_hours': 1, 'importance': 5,
+             'dependencies': [i + 2] if i + 2 <= 3000 else [1]}
+            for i in range(1, 3001)
+        ]
+        response = self.client.post('/api/tasks/analyze/', chain, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        
+        run_pending_jobs()
+        job_status = self.client.get(response.json()['status_url']).json()
+        self.assertEqual(job_status['status'], AnalysisJob.STATUS_FAILED)
+        self.assertIn('Circular dependencies detected', job_status['error'])
+    
+    @override_settings(ANALYSIS_JOB_PAGE_SIZE=2)
+    def test_results_are_stored_and_read_in_chunks(self):
+        today = str(date.today())
+        tasks = [
+            {'title': f'Task {i}', 'due_date': today, 'estimated_hours': 1, 'importance': i}
+            for i in range(1, 8)
+        ]
+        response = self.client.post('/api/tasks/analyze/', tasks, content_type='application/json')
+        run_pending_jobs()
+        
+        job = AnalysisJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.result_chunks.count(), 4)
+        
+        page = self.client.get(response.json()['status_url'], {'offset': 1, 'limit': 2}).json()
+        self.assertEqual([task['importance'] for task in page['tasks']], [6, 5])
+        self.assertEqual(page['next_offset'], 3)
+        
+        capped_page = self.client.get(response.json()['status_url'], {'limit': 10000000}).json()
+        self.assertEqual(capped_page['limit'], 2)
+        self.assertEqual([task['importance'] for task in capped_page['tasks']], [7, 6])
+        self.assertEqual(capped_page['next_offset'], 2)
+        
+        last_page = self.client.get(response.json()['status_url'], {'offset': 6}).json()
+        self.assertEqual([task['importance'] for task in last_page['tasks']], [1])
+        self.assertIsNone(last_page['next_offset'])
+    
+    @override_settings(ANALYSIS_JOB_STALE_SECONDS=60)
+    def test_stale_running_jobs_are_failed(self):
+        response = self.client.post('/api/tasks/analyze/', self.tasks, content_type='application/json')
+        job = claim_next_job()
+        
+        self.assertEqual(self.client.get(response.json()['status_url']).json()['status'], AnalysisJob.STATUS_RUNNING)
+        
+        AnalysisJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(seconds=61))
+        job_status = self.client.get(response.json()['status_url']).json()
+        self.assertEqual(job_status['status'], AnalysisJob.STATUS_FAILED)
+        
+        # A worker that finishes late does not overwrite the failure
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+    
+    def test_expired_jobs_are_gone_and_purged(self):
+        response = self.client.post('/api/tasks/analyze/', self.tasks, content_type='application/json')
+        job = AnalysisJob.objects.get(pk=response.json()['job_id'])
+        AnalysisJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        
+        self.assertEqual(run_pending_jobs(), 0)
+        self.assertEqual(self.client.get(response.json()['status_url']).status_code, 410)
+        self.assertEqual(purge_expired_jobs(), 1)
+        self.assertEqual(self.client.get(response.json()['status_url']).status_code, 404)
+
+
+class LoadTestCommandTests(SimpleTestCase):
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+    
+    def test_synthetic_backlog_has_no_circular_dependencies(self):
+        backlog = build_backlog(200, seed=3)
+        self.assertEqual(len(backlog), 200)
+        self.assertEqual(TaskScorer().detect_circular_dependencies(backlog), [])
+    
+    def test_in_process_run_writes_json_report(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, 'report.json')
+            call_command('loadtest', sizes='5', endpoints='analyze', requests=4, concurrency=2,
+                         output=output, stdout=io.StringIO())
+            with open(output) as report_file:
+                report = json.load(report_file)
+        
+        scenario = report['scenarios'][0]
+        self.assertEqual(scenario['requests'], 4)
+        self.assertEqual(scenario['errors'], 0)
+        self.assertIsNotNone(scenario['latency_ms']['p99'])
+
+
+class TaskValidationTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+    
+    def test_normalizes_values_into_typed_fields(self):
+        tasks, errors = normalize_tasks([
+            {'title': 'A', 'due_date': str(self.today), 'estimated_hours': '2.5', 'importance': '7'},
+            {'title': 'B', 'due_date': str(self.today), 'estimated_hours': 1, 'importance': 3, 'dependencies': [1]},
+        ])
+        self.assertEqual(errors, [])
+        self.assertEqual(tasks[0]['due_date'], self.today)
+        self.assertEqual(tasks[0]['estimated_hours'], 2.5)
+        self.assertEqual(tasks[0]['importance'], 7)
+        self.assertEqual(tasks[0]['dependencies'], [])
+        self.assertEqual(tasks[1]['dependencies'], [1])
+    
+    def test_collects_all_errors_with_indexes(self):
+        _, errors = normalize_tasks([
+            {'title': 'Missing fields'},
+            {'title': 'Bad values', 'due_date': 'soon', 'estimated_hours': -1, 'importance': 11},
+            {'title': 'Unknown dependency', 'due_date': str(self.today), 'estimated_hours': 1,
+             'importance': 5, 'dependencies': [9]},
+            {'title': 'Infinite hours', 'due_date': str(self.today), 'estimated_hours': 'inf', 'importance': 5},
+            {'title': 'Overflowing hours', 'due_date': str(self.today), 'estimated_hours': '1e999', 'importance': 5},
+            {'title': 'Huge integer hours', 'due_date': str(self.today), 'estimated_hours': 10 ** 400, 'importance': 5},
+        ])
+        self.assertEqual(
+            [(error['index'], error['field']) for error in errors],
+            [(0, 'due_date'), (0, 'estimated_hours'), (0, 'importance'),
+             (1, 'due_date'), (1, 'estimated_hours'), (1, 'importance'),
+             (2, 'dependencies'), (3, 'estimated_hours'), (4, 'estimated_hours'), (5, 'estimated_hours')]
+        )
+        self.assertEqual(errors[-1]['error'], 'Estimated hours must be a number')
+    
+    def test_suggest_endpoint_rejects_invalid_tasks(self):
+        response = self.client.post(
+            '/api/tasks/suggest/',
+            [{'title': 'Bad', 'due_date': str(self.today), 'estimated_hours': 'lots', 'importance': 5}],
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['field'], 'estimated_hours')
+
+
+class TaskSnapshotTests(TestCase):
+    def setUp(self):
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(TASK_SNAPSHOT_DIR=self.snapshot_dir.name)
+        self.settings_override.enable()
+        
+        today = date.today()
+        self.tasks, _ = normalize_tasks([
+            {'title': 'Ship release ✨', 'due_date': str(today), 'estimated_hours': 2, 'importance': 9},
+            {'title': 'Write notes', 'due_date': str(today + timedelta(days=5)), 'estimated_hours': 0.5,
+             'importance': 4, 'dependencies': [1]},
+            {'title': 'Plan next sprint', 'due_date': str(today - timedelta(days=2)), 'estimated_hours': 10,
+             'importance': 6, 'dependencies': [1, 2]},
+        ])
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        self.snapshot_dir.cleanup()
+    
+    def test_snapshot_round_trip(self):
+        with open_snapshot(save_snapshot(self.tasks)) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(snapshot.to_tasks(), self.tasks)
+    
+    def test_truncated_snapshot_is_rejected(self):
+        snapshot_id = save_snapshot(self.tasks)
+        path = snapshot_path(snapshot_id)
+        
+        for size in (70, 0):
+            with open(path, 'r+b') as snapshot_file:
+                snapshot_file.truncate(size)
+            with self.assertRaisesMessage(ValueError, 'Snapshot file is truncated'):
+                open_snapshot(snapshot_id)
+        
+        response = self.client.post('/api/tasks/analyze/', {'snapshot_id': snapshot_id}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_snapshot_scores_match_task_scores(self):
+        scorer = TaskScorer('fastest_wins')
+        with open_snapshot(save_snapshot(self.tasks)) as snapshot:
+            snapshot_scores = scorer.score_snapshot(snapshot)
+        self.assertEqual(snapshot_scores, scorer.score_tasks(self.tasks))
+        
+        # Task 2 depends on task 1 and is itself a dependency of task 3
+        write_notes = next(task for task in snapshot_scores if task['title'] == 'Write notes')
+        self.assertEqual(write_notes['component_scores']['dependency'], 1.0)
+        plan_sprint = next(task for task in snapshot_scores if task['title'] == 'Plan next sprint')
+        self.assertEqual(plan_sprint['component_scores']['dependency'], 0.5)
+    
+    def test_analyze_endpoint_targets_snapshot_by_id(self):
+        snapshot_id = save_snapshot(self.tasks)
+        response = self.client.post('/api/tasks/analyze/', {'snapshot_id': snapshot_id}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_tasks'], 3)
+        
+        missing = self.client.post('/api/tasks/analyze/', {'snapshot_id': '0' * 32}, content_type='application/json')
+        self.assertEqual(missing.status_code, 404)
+    
+    def test_build_command_remaps_db_dependencies(self):
+        first = Task.objects.create(title='First', due_date=date.today(), estimated_hours=1, importance=5)
+        second = Task(title='Second', due_date=date.today(), estimated_hours=3, importance=7)
+        second.set_dependencies([first.id, 9999])
+        second.save()
+        
+        out = io.StringIO()
+        call_command('build_task_snapshot', stdout=out)
+        snapshot_id = out.getvalue().split()[2]
+        
+        with open_snapshot(snapshot_id) as snapshot:
+            self.assertEqual(snapshot.title(1), 'Second')
+            self.assertEqual(snapshot.dependencies(1), [1])
+
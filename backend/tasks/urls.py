@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path('tasks/analyze/', views.analyze_tasks, name='analyze-tasks'),
     path('tasks/suggest/', views.suggest_tasks, name='suggest-tasks'),
+    path('tasks/jobs/<uuid:job_id>/', views.analysis_job_status, name='analysis-job-status'),
 ]
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Single-pass validation and normalization of incoming task batches.
+
+Every task is parsed once into typed values (date, float, int, list of ints) and all
+problems are collected with the index of the offending task, so the scorer can run
+on clean data without per-field exception handling.
+"""
+from datetime import date
+import math
+
+
+def _parse_title(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError('Title must be a non-empty string')
+    return value
+
+
+def _parse_due_date(value, date_cache):
+    if type(value) is date:
+        return value
+    if not isinstance(value, str):
+        raise ValueError('Due date must be an ISO date string (YYYY-MM-DD)')
+
+    # Large backlogs repeat the same handful of dates, so parse each string once
+    parsed = date_cache.get(value)
+    if parsed is None:
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            raise ValueError('Due date must be an ISO date string (YYYY-MM-DD)')
+        date_cache[value] = parsed
+    return parsed
+
+
+def _parse_estimated_hours(value):
+    value_type = type(value)
+    if value_type is not int and value_type is not float and value_type is not str:
+        raise ValueError('Estimated hours must be a number')
+    try:
+        value = float(value)
+    except (ValueError, OverflowError):
+        raise ValueError('Estimated hours must be a number')
+    if not math.isfinite(value):
+        raise ValueError('Estimated hours must be a number')
+    if not value > 0:
+        raise ValueError('Estimated hours must be positive')
+    return value
+
+
+def _parse_importance(value):
+    value_type = type(value)
+    if value_type is not int:
+        if value_type is float and value.is_integer():
+            value = int(value)
+        elif value_type is str:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError('Importance must be an integer')
+        else:
+            raise ValueError('Importance must be an integer')
+    if value < 1 or value > 10:
+        raise ValueError('Importance must be between 1 and 10')
+    return value
+
+
+def _parse_dependencies(value, batch_size):
+    if not isinstance(value, list):
+        raise ValueError('Dependencies must be a list')
+    for dependency in value:
+        if type(dependency) is not int:
+            raise ValueError('All dependencies must be integers')
+        if dependency < 1 or dependency > batch_size:
+            raise ValueError(f'Dependency {dependency} does not match any task in the batch')
+    return value
+
+
+def normalize_tasks(tasks_data):
+    """
+    Validate and normalize a batch of task dicts in one pass.
+
+    Returns (tasks, errors). Each normalized task is a copy of the input dict with
+    typed values; each error is {'index', 'field', 'error'} using the 0-based
+    position of the task in the batch. Tasks are only usable when errors is empty.
+    """
+    if not isinstance(tasks_data, list):
+        return [], [{'index': None, 'field': 'tasks', 'error': 'Expected a list of tasks'}]
+
+    batch_size = len(tasks_data)
+    date_cache = {}
+    tasks = []
+    errors = []
+
+    field_parsers = (
+        ('title', _parse_title),
+        ('due_date', lambda value: _parse_due_date(value, date_cache)),
+        ('estimated_hours', _parse_estimated_hours),
+        ('importance', _parse_importance),
+    )
+
+    for index, task_data in enumerate(tasks_data):
+        if not isinstance(task_data, dict):
+            errors.append({'index': index, 'field': None, 'error': 'Task must be an object'})
+            continue
+
+        task = dict(task_data)
+        for field, parse in field_parsers:
+            if field not in task_data:
+                errors.append({'index': index, 'field': field, 'error': 'This field is required'})
+                continue
+            try:
+                task[field] = parse(task_data[field])
+            except ValueError as e:
+                errors.append({'index': index, 'field': field, 'error': str(e)})
+
+        try:
+            task['dependencies'] = _parse_dependencies(task_data.get('dependencies', []), batch_size)
+        except ValueError as e:
+            errors.append({'index': index, 'field': 'dependencies', 'error': str(e)})
+
+        tasks.append(task)
+
+    return tasks, errors
@@ -1,7 +1,22 @@
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from django.urls import reverse
+from .jobs import enqueue_analysis, fail_stale_jobs, get_async_threshold, get_page_size
+from .models import AnalysisJob
 from .scoring import TaskScorer
+from .snapshots import open_snapshot
+from .validation import normalize_tasks
+
+
+def validation_error_response(errors):
+    return Response(
+        {
+            "error": f"{len(errors)} validation error(s) in submitted tasks",
+            "errors": errors
+        },
+        status=status.HTTP_400_BAD_REQUEST
+    )
 
 @api_view(['POST'])
 def analyze_tasks(request):
@@ -18,6 +33,10 @@ def analyze_tasks(request):
         elif isinstance(request.data, dict):
             tasks_data = request.data.get('tasks', [])
             strategy = request.data.get('strategy', 'smart_balance')
+            
+            # A stored snapshot replaces the tasks array
+            if request.data.get('snapshot_id'):
+                return analyze_snapshot(request.data['snapshot_id'], strategy)
         else:
             return Response(
                 {"error": "Expected a list of tasks or object with tasks array"}, 
@@ -32,34 +51,38 @@ def analyze_tasks(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate tasks
-        for i, task_data in enumerate(tasks_data):
-            if not all(key in task_data for key in ['title', 'due_date', 'estimated_hours', 'importance']):
-                return Response(
-                    {"error": f"Task {i+1} is missing required fields (title, due_date, estimated_hours, importance)"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        # Validate and normalize all tasks in one pass
+        normalized_tasks, errors = normalize_tasks(tasks_data)
+        if errors:
+            return validation_error_response(errors)
+        
+        # Oversized batches are handed to the background job queue before any further
+        # work on the batch; the worker runs the circular dependency check
+        if len(tasks_data) > get_async_threshold():
+            job = enqueue_analysis(tasks_data, strategy)
+            print(f"⏳ Queued analysis job {job.pk} for {job.total_tasks} tasks")  # Debug log
+            
+            return Response({
+                'job_id': str(job.pk),
+                'status': job.status,
+                'status_url': reverse('analysis-job-status', args=[job.pk]),
+                'total_tasks': job.total_tasks,
+                'message': f'Analysis of {job.total_tasks} tasks has been queued'
+            }, status=status.HTTP_202_ACCEPTED)
         
         # Initialize scorer
         scorer = TaskScorer(strategy)
         
         # Check for circular dependencies
-        circular_deps = scorer.detect_circular_dependencies(tasks_data)
+        circular_deps = scorer.detect_circular_dependencies(normalized_tasks)
         if circular_deps:
             return Response(
                 {"error": f"Circular dependencies detected: {circular_deps}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Calculate scores for all tasks
-        scored_tasks = []
-        for task_data in tasks_data:
-            score_result = scorer.calculate_priority_score(task_data, tasks_data)
-            scored_task = {**task_data, **score_result}
-            scored_tasks.append(scored_task)
-        
-        # Sort by priority score (descending)
-        sorted_tasks = sorted(scored_tasks, key=lambda x: x['priority_score'], reverse=True)
+        # Calculate scores for all tasks, sorted by priority score (descending)
+        sorted_tasks = scorer.score_tasks(normalized_tasks)
         
         print(f"✅ Successfully analyzed {len(sorted_tasks)} tasks")  # Debug log
         
@@ -80,6 +103,35 @@ def analyze_tasks(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+def analyze_snapshot(snapshot_id, strategy):
+    """
+    Analyze a stored columnar snapshot; it was validated when it was built
+    """
+    try:
+        snapshot = open_snapshot(snapshot_id)
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except FileNotFoundError:
+        return Response(
+            {"error": "Snapshot not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    with snapshot:
+        print(f"📊 Processing snapshot {snapshot_id} ({len(snapshot)} tasks) with strategy: {strategy}")  # Debug log
+        sorted_tasks = TaskScorer(strategy).score_snapshot(snapshot)
+    
+    return Response({
+        'strategy_used': strategy,
+        'snapshot_id': snapshot_id,
+        'tasks': sorted_tasks,
+        'total_tasks': len(sorted_tasks),
+        'message': f'Successfully analyzed {len(sorted_tasks)} tasks using {strategy} strategy'
+    })
+
 @api_view(['POST'])
 def suggest_tasks(request):
     """
@@ -109,18 +161,16 @@ def suggest_tasks(request):
                 'explanation': 'No tasks provided for suggestions'
             })
         
+        # Validate and normalize all tasks in one pass
+        normalized_tasks, errors = normalize_tasks(tasks_data)
+        if errors:
+            return validation_error_response(errors)
+        
         # Initialize scorer
         scorer = TaskScorer(strategy)
-        scored_tasks = []
-        
-        # Calculate scores for all tasks
-        for task_data in tasks_data:
-            score_result = scorer.calculate_priority_score(task_data, tasks_data)
-            scored_task = {**task_data, **score_result}
-            scored_tasks.append(scored_task)
         
         # Get top 3 tasks
-        top_tasks = sorted(scored_tasks, key=lambda x: x['priority_score'], reverse=True)[:3]
+        top_tasks = scorer.score_tasks(normalized_tasks)[:3]
         
         # Generate detailed explanations for each suggestion
         for i, task in enumerate(top_tasks):
@@ -154,4 +204,70 @@ def suggest_tasks(request):
         return Response(
             {"error": f"An error occurred while generating suggestions: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+@api_view(['GET'])
+def analysis_job_status(request, job_id):
+    """
+    Poll a queued analysis job; finished results are paged with offset/limit (limit is capped at the page size)
+    """
+    try:
+        job = AnalysisJob.objects.get(pk=job_id)
+    except AnalysisJob.DoesNotExist:
+        return Response(
+            {"error": "Analysis job not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    if job.is_expired():
+        return Response(
+            {"error": "Analysis job has expired"},
+            status=status.HTTP_410_GONE
+        )
+    
+    # Jobs whose worker died would otherwise report running until they expire
+    if job.status == AnalysisJob.STATUS_RUNNING and fail_stale_jobs(job.pk):
+        job.refresh_from_db()
+    
+    response_data = {
+        'job_id': str(job.pk),
+        'status': job.status,
+        'strategy_used': job.strategy,
+        'total_tasks': job.total_tasks,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'expires_at': job.expires_at,
+    }
+    
+    if job.status == AnalysisJob.STATUS_FAILED:
+        response_data['error'] = job.error
+    
+    if job.status == AnalysisJob.STATUS_DONE:
+        try:
+            offset = int(request.query_params.get('offset', 0))
+            limit = int(request.query_params.get('limit', get_page_size()))
+        except ValueError:
+            return Response(
+                {"error": "offset and limit must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if offset < 0 or limit < 1:
+            return Response(
+                {"error": "offset must be >= 0 and limit must be >= 1"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Pages never span more than one stored chunk's worth of rows
+        limit = min(limit, get_page_size())
+        next_offset = offset + limit if offset + limit < job.total_tasks else None
+        
+        response_data.update({
+            'tasks': job.get_result_page(offset, limit),
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset,
+        })
+    
+    return Response(response_data)